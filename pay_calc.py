@@ -1,131 +1,143 @@
 import numpy as np
+from joblib import Parallel, delayed
+
+DENOMS = (500, 200, 100, 50, 20, 10)
+
+def count_bills_array(amounts):
+    """
+    Break down an array of amounts into bills of different denominations.
+    Returns a (6, *amounts.shape) array with the count of each bill type
+    (ordered as DENOMS) and the remainder that no bill covers.
+    """
+    remaining = np.asarray(amounts, dtype=np.int64)
+    bills = np.empty((len(DENOMS),) + remaining.shape, dtype=np.int64)
+    
+    for i, denomination in enumerate(DENOMS):
+        bills[i], remaining = np.divmod(remaining, denomination)
+    
+    return bills, remaining
 
 def count_bills(N):
     """
     Break down amount N into bills of different denominations.
     Returns the count of each bill type.
     """
-    bills = {
-        500: 0,
-        200: 0,
-        100: 0,
-        50: 0,
-        20: 0,
-        10: 0
-    }
-    
-    remaining = N
-    
-    bills[500] = remaining // 500
-    remaining = remaining % 500
+    counts, remaining = count_bills_array(N)
+    bills = {d: int(c) for d, c in zip(DENOMS, counts)}
     
-    bills[200] = remaining // 200
-    remaining = remaining % 200
+    return bills, int(remaining)
+
+# simulation setup
+num_simulations = 1000
+n = 400  # number of payments
+seed = 42  # set to None for a fresh random run
+
+set_reward = 280
+attention_check_reward = 20
+attention_check_prob = 0.8
+max_work_return = 100  # work return is drawn uniformly from 0..max_work_return
+treated_work_chance = 0.25
+treated_work_reward_per_minute = 3
+treated_work_time = 30
+treated_work_reward = treated_work_reward_per_minute * treated_work_time
+max_reward = set_reward + attention_check_reward + max_work_return + treated_work_reward
+
+# bill counts for every reachable rounded reward (0 CZK up to max_reward
+# rounded to 10), shape (K, 6); row k holds the breakdown of k * 10 CZK
+BILLS_TABLE = count_bills_array(np.arange(0, max_reward + 10, 10))[0].T.astype(np.int8)
+
+def run_chunk(seed, s_chunk, n):
+    """
+    Simulate s_chunk independent runs of n payments each.
+    Returns the bills needed per simulation, shape (6, s_chunk),
+    and the total payment per simulation, shape (s_chunk,).
+    """
+    rng = np.random.default_rng(seed)
+    shape = (s_chunk, n)
     
-    bills[100] = remaining // 100
-    remaining = remaining % 100
+    # draw every payment of every simulation at once; rewards are whole CZK,
+    # so everything stays in int16 (ample for rewards of a few thousand CZK)
+    # (Bernoulli draws as a uniform comparison, ~4x cheaper than binomial(n=1))
+    attention_check_result = rng.random(shape, dtype=np.float32) < attention_check_prob
     
-    bills[50] = remaining // 50
-    remaining = remaining % 50
+    willingness_to_work = rng.integers(0, max_work_return + 1, size=shape, dtype=np.int16)
+    rnd_work_return = rng.integers(0, max_work_return + 1, size=shape, dtype=np.int16)
     
-    bills[20] = remaining // 20
-    remaining = remaining % 20
+    decleared_work_reward = np.where(willingness_to_work <= rnd_work_return, rnd_work_return, np.int16(0))
     
-    bills[10] = remaining // 10
-    remaining = remaining % 10
+    treated = rng.random(shape, dtype=np.float32) < treated_work_chance
+    # total reward calculation
+    total_reward = (set_reward
+                    + np.int16(attention_check_reward) * attention_check_result
+                    + decleared_work_reward
+                    + np.int16(treated_work_reward) * treated)
+    # round half up to nearest 10, kept as the number of tens (BILLS_TABLE row)
+    tens = ((total_reward + 5) // 10).astype(np.int16, copy=False)
+    # histogram of rounded rewards per simulation, shape (s_chunk, K);
+    # a reward beyond the table would spill into the next simulation's row
+    n_values = len(BILLS_TABLE)
+    top = int(tens.max(initial=0))
+    if top >= n_values:
+        raise ValueError(f"reward of {top * 10} CZK exceeds BILLS_TABLE "
+                         f"(up to {(n_values - 1) * 10} CZK)")
+    offsets = tens + n_values * np.arange(s_chunk)[:, None]
+    payments_per_value = np.bincount(offsets.ravel(), minlength=s_chunk * n_values).reshape(s_chunk, n_values)
+    # bills needed per simulation, shape (s_chunk, 6), accumulated in int64
+    bills_needed = np.matmul(payments_per_value, BILLS_TABLE, dtype=np.int64)
     
-    return bills, remaining
-# simulation setup
-simulation_results = {
-    500: [],
-    200: [],
-    100: [],
-    50: [],
-    20: [],
-    10: []
-}
-
-total_payments_per_simulation = []
-
-num_simulations = 1000
+    return bills_needed.T, tens.sum(axis=1, dtype=np.int64) * 10
 
-for sim in range(num_simulations):
-    # initialize
-    total_bills = {
-        500: 0,
-        200: 0,
-        100: 0,
-        50: 0,
-        20: 0,
-        10: 0
-    }
+def simulate(num_simulations, n, seed=None, n_jobs=-1, chunk_size=100):
+    """
+    Run the simulations in chunks of chunk_size, each with an independent
+    generator spawned from a single seed (fresh OS entropy if seed is None),
+    and spread the chunks over n_jobs worker processes. The chunking does
+    not depend on n_jobs, so a fixed seed gives the same results on any
+    number of cores.
+    """
+    chunk_sizes = [chunk_size] * (num_simulations // chunk_size)
+    if num_simulations % chunk_size:
+        chunk_sizes.append(num_simulations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
     
-    total_payment_this_sim = 0
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(run_chunk)(s, s_chunk, n) for s, s_chunk in zip(seeds, chunk_sizes)
+    )
     
-    n = 400  # number of payments
-    for iteration in range(n):
-        set_reward = 280
-        attention_check_reward = 20
-        attention_check_prob = 0.8
-        attention_check_result = np.random.binomial(n=1, p=attention_check_prob)
-        
-        willingness_to_work = np.random.uniform(low=0, high=100)
-        rnd_work_return = np.random.uniform(low=0, high=100)
-        
-        if willingness_to_work <= rnd_work_return:
-            decleared_work_reward = rnd_work_return
-        else:
-            decleared_work_reward = 0
-        
-        treated_work_chance = 0.25
-        treated = np.random.binomial(n=1, p=treated_work_chance)
-        treated_work_reward_per_minute = 3
-        treated_work_time = 30
-        treated_work_reward = treated_work_reward_per_minute * treated_work_time * treated
-        # total reward calculation
-        total_reward = set_reward + attention_check_reward * attention_check_result + decleared_work_reward + treated_work_reward
-        # round to nearest 10
-        total_reward_rounded = round(total_reward / 10) * 10
-        # accumulate total payment for this simulation
-        total_payment_this_sim += total_reward_rounded
-        # count bills needed
-        bills_needed, leftover = count_bills(total_reward_rounded)
-        
-        for denomination, count in bills_needed.items():
-            total_bills[denomination] += count
+    per_sim_bills = np.concatenate([bills for bills, _ in results], axis=1)
+    per_sim_totals = np.concatenate([totals for _, totals in results])
     
-    for denomination in simulation_results.keys():
-        simulation_results[denomination].append(total_bills[denomination])
-    # accumulate total payment for this simulation
-    total_payments_per_simulation.append(total_payment_this_sim)
-# print results
-print(f"Monte Carlo Simulation Results ({num_simulations} simulations of {n} payments each)")
-print("=" * 70)
-print(f"\nTotal Payment Statistics:")
-mean_total = np.mean(total_payments_per_simulation)
-std_total = np.std(total_payments_per_simulation)
-min_total = np.min(total_payments_per_simulation)
-max_total = np.max(total_payments_per_simulation)
+    return per_sim_bills, per_sim_totals
 
-print(f"Expected total payment: {mean_total:.2f} CZK ± {std_total:.2f}")
-print(f"Min total payment: {min_total:.2f} CZK")
-print(f"Max total payment: {max_total:.2f} CZK")
-print(f"95% CI: [{mean_total - 2*std_total:.2f}, {mean_total + 2*std_total:.2f}] CZK")
+if __name__ == "__main__":
+    # bills needed per simulation, shape (6, num_simulations)
+    simulation_results, total_payments_per_simulation = simulate(num_simulations, n, seed)
+    # print results
+    print(f"Monte Carlo Simulation Results ({num_simulations} simulations of {n} payments each)")
+    print("=" * 70)
+    print(f"\nTotal Payment Statistics:")
+    # row 0 = total payment, rows 1-6 = bills per denomination (as DENOMS)
+    results = np.vstack([total_payments_per_simulation, simulation_results])
+    means = results.mean(axis=1)
+    stds = results.std(axis=1)
+    mins = results.min(axis=1)
+    maxs = results.max(axis=1)
 
-print(f"\nExpected bills needed (mean ± std):")
-for denomination in [500, 200, 100, 50, 20, 10]:
-    mean_bills = np.mean(simulation_results[denomination])
-    std_bills = np.std(simulation_results[denomination])
-    min_bills = np.min(simulation_results[denomination])
-    max_bills = np.max(simulation_results[denomination])
-    
-    print(f"{denomination} CZK: {mean_bills:.1f} ± {std_bills:.1f} bills (min: {min_bills}, max: {max_bills})")
+    mean_total, std_total = means[0], stds[0]
+    print(f"Expected total payment: {mean_total:.2f} CZK ± {std_total:.2f}")
+    print(f"Min total payment: {mins[0]:.2f} CZK")
+    print(f"Max total payment: {maxs[0]:.2f} CZK")
+    print(f"95% CI: [{mean_total - 2*std_total:.2f}, {mean_total + 2*std_total:.2f}] CZK")
 
-print(f"\n95% confidence intervals for bills (approximately mean ± 2*std):")
-for denomination in [500, 200, 100, 50, 20, 10]:
-    mean_bills = np.mean(simulation_results[denomination])
-    std_bills = np.std(simulation_results[denomination])
-    lower = mean_bills - 2 * std_bills
-    upper = mean_bills + 2 * std_bills
-    
-    print(f"{denomination} CZK: [{lower:.0f}, {upper:.0f}] bills")
\ No newline at end of file
+    bill_stats = list(zip(DENOMS, means[1:], stds[1:], mins[1:], maxs[1:]))
+
+    print(f"\nExpected bills needed (mean ± std):")
+    for denomination, mean_bills, std_bills, min_bills, max_bills in bill_stats:
+        print(f"{denomination} CZK: {mean_bills:.1f} ± {std_bills:.1f} bills (min: {min_bills}, max: {max_bills})")
+
+    print(f"\n95% confidence intervals for bills (approximately mean ± 2*std):")
+    for denomination, mean_bills, std_bills, _, _ in bill_stats:
+        lower = mean_bills - 2 * std_bills
+        upper = mean_bills + 2 * std_bills
+        
+        print(f"{denomination} CZK: [{lower:.0f}, {upper:.0f}] bills")
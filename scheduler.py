@@ -1,20 +1,25 @@
 import numpy as np
 from typing import List, Dict, Tuple
 
+# HARD CONSTRAINT: No sessions on Thursday slots 2 and 3
+_HARD_MASK = np.ones((5, 6), dtype=np.int8)
+_HARD_MASK[3, 2] = 0  # Thursday slot 2 (12:45-14:15)
+_HARD_MASK[3, 3] = 0  # Thursday slot 3 (14:30-16:00)
+
 class RA:
     def __init__(self, name, availability=None, max_slots_per_week=None):
         self.name = name
         # 5 days x 6 time slots matrix
-        # 1 = available, 0 = not available
+        # 1 = available, 0 = not available (any other input value counts as 0)
+        # Hard constraints are always applied on top (see _HARD_MASK)
         if availability is None:
             # Default: all available
-            self.availability = np.ones((5, 6), dtype=int)
+            self.availability = _HARD_MASK.copy()
         else:
-            self.availability = np.array(availability, dtype=int)
-        
-        # HARD CONSTRAINT: No sessions on Thursday slots 2 and 3
-        self.availability[3, 2] = 0  # Thursday slot 2 (12:45-14:15)
-        self.availability[3, 3] = 0  # Thursday slot 3 (14:30-16:00)
+            availability = np.asarray(availability)
+            if availability.shape != (5, 6):
+                raise ValueError(f"availability must be a 5x6 matrix, got shape {availability.shape}")
+            self.availability = (availability == 1).astype(np.int8) * _HARD_MASK
         
         # Max slots per week
         if max_slots_per_week is not None:
@@ -65,47 +70,67 @@ class GreedyScheduler:
     
     def __init__(self, ras: List[RA]):
         self.ras = ras
-        self.schedule = {}  # key: (day, slot), value: [RA names]
-        self.ra_stats = {}  # Track assignments per RA
-        
-        # Initialize tracking
-        for ra in ras:
-            self.ra_stats[ra.name] = {
-                'weekly': 0,
-                'daily': [0, 0, 0, 0, 0],  # slots per day
-                'slots': []  # list of (day, slot) tuples
-            }
+        # schedule[day, slot] = indices of the 2 assigned RAs (-1 = empty)
+        self.schedule = np.full((5, 6, 2), -1, dtype=np.int16)
+        self.slot_fill = np.zeros((5, 6), dtype=np.int8)  # RAs per slot
+        self.name_to_idx = {ra.name: i for i, ra in enumerate(ras)}
+        
+        # Track assignments per RA, indexed by position in self.ras, so
+        # that every RA can be checked against a slot in one vectorized
+        # expression
+        self.avail = np.array([ra.availability for ra in ras], dtype=bool).reshape(-1, 5, 6)
+        self.limits = np.array([ra.max_slots_per_week for ra in ras], dtype=np.int16)
+        self.weekly = np.zeros(len(ras), dtype=np.int16)  # slots per week
+        self.daily = np.zeros((len(ras), 5), dtype=np.int8)  # slots per day
+        self.day_slots = [[[] for _ in range(5)] for _ in ras]  # assigned slots, per day
     
     def can_assign(self, ra: RA, day: int, slot: int) -> bool:
         """Check if RA can be assigned to this slot (all hard constraints)"""
+        return self.can_assign_idx(self.name_to_idx[ra.name], day, slot)
+    
+    def can_assign_idx(self, i: int, day: int, slot: int) -> bool:
+        """Check if the RA at index i can be assigned to this slot"""
+        # .item() returns plain Python scalars, skipping the NumPy scalar
+        # boxing of regular indexing on this per-RA path
         # Constraint 1: Availability
-        if ra.availability[day, slot] != 1:
+        if not self.avail.item(i, day, slot):
             return False
         
         # Constraint 2: Weekly limit
-        if self.ra_stats[ra.name]['weekly'] >= ra.max_slots_per_week:
+        if self.weekly.item(i) >= self.limits.item(i):
             return False
         
         # Constraint 3: Daily limit (max 2 sessions per day)
-        if self.ra_stats[ra.name]['daily'][day] >= 2:
+        if self.daily.item(i, day) >= 2:
             return False
         
         return True
     
     def assign(self, ra: RA, day: int, slot: int):
-        """Assign RA to a slot and update all tracking"""
-        key = (day, slot)
-        if key not in self.schedule:
-            self.schedule[key] = []
-        
-        self.schedule[key].append(ra.name)
-        self.ra_stats[ra.name]['weekly'] += 1
-        self.ra_stats[ra.name]['daily'][day] += 1
-        self.ra_stats[ra.name]['slots'].append((day, slot))
+        """Assign RA to a slot (at most 2 RAs per slot) and update all tracking"""
+        self.assign_idx(self.name_to_idx[ra.name], day, slot)
+    
+    def assign_idx(self, i: int, day: int, slot: int):
+        """Assign the RA at index i to a slot (at most 2 RAs per slot)"""
+        if self.slot_fill[day, slot] >= self.schedule.shape[2]:
+            raise ValueError(f"slot ({day}, {slot}) already has "
+                             f"{self.schedule.shape[2]} RAs assigned")
+        
+        self.schedule[day, slot, self.slot_fill[day, slot]] = i
+        self.slot_fill[day, slot] += 1
+        self.weekly[i] += 1
+        self.daily[i, day] += 1
+        self.day_slots[i][day].append(slot)
+    
+    def eligible_mask(self, day: int, slot: int) -> np.ndarray:
+        """Boolean mask over RAs who can work this slot"""
+        return (self.avail[:, day, slot]
+                & (self.weekly < self.limits)
+                & (self.daily[:, day] < 2))
     
     def get_available_ras(self, day: int, slot: int) -> List[RA]:
         """Get all RAs who can work this slot"""
-        return [ra for ra in self.ras if self.can_assign(ra, day, slot)]
+        return [self.ras[i] for i in np.flatnonzero(self.eligible_mask(day, slot))]
     
     def schedule_greedy(self):
         """
@@ -114,33 +139,39 @@ class GreedyScheduler:
         Strategy:
         1. Prioritize slots that have RAs with least overall availability
         2. This ensures we use constrained RAs before they run out of capacity
+        3. Staff each slot with the 2 most constrained RAs still available
         """
-        # Step 1: Build list of all potential slots with their criticality
-        slots = []
+        # Step 1: Criticality of every slot at once
+        # active[r, day, slot] = RA r can currently work that slot
+        active = (self.avail
+                  & (self.weekly < self.limits)[:, None, None]
+                  & (self.daily < 2)[:, :, None])
         
-        for day in range(5):
-            for slot in range(6):
-                available = self.get_available_ras(day, slot)
-                
-                if len(available) >= 2:
-                    # Criticality = prioritize slots with most constrained RAs
-                    # Sum of (1 / max_slots_per_week) for available RAs
-                    # Higher sum = more constrained RAs available = higher priority
-                    criticality = sum(1.0 / ra.max_slots_per_week for ra in available)
-                    
-                    slots.append((day, slot, criticality))
+        # Criticality = prioritize slots with most constrained RAs
+        # Sum of (1 / max_slots_per_week) for available RAs
+        # Higher sum = more constrained RAs available = higher priority
+        # (RAs with a zero limit are never active, so clamp to avoid 1/0)
+        inv_limits = 1.0 / np.maximum(self.limits, 1)
+        criticality = (active * inv_limits[:, None, None]).sum(axis=0)
+        
+        # Only slots with at least 2 available RAs can be covered
+        days, slots = np.nonzero(active.sum(axis=0) >= 2)
         
         # Step 2: Sort by criticality (most constrained RAs first)
-        slots.sort(key=lambda x: x[2], reverse=True)
+        order = np.argsort(-criticality[days, slots], kind='stable')
         
         # Step 3: Assignment loop
-        for day, slot, _ in slots:
-            available = self.get_available_ras(day, slot)
+        for day, slot in zip(days[order].tolist(), slots[order].tolist()):
+            # Earlier assignments may have used up some RAs' limits
+            eligible = self.eligible_mask(day, slot)
             
-            if len(available) >= 2:
-                # Assign the first 2 available RAs
-                self.assign(available[0], day, slot)
-                self.assign(available[1], day, slot)
+            if np.count_nonzero(eligible) >= 2:
+                # Assign the 2 most constrained (lowest limit) available RAs,
+                # ties broken by order in self.ras
+                scores = np.where(eligible, inv_limits, -np.inf)
+                top2 = np.sort(np.argsort(-scores, kind='stable')[:2])
+                self.assign_idx(top2[0], day, slot)
+                self.assign_idx(top2[1], day, slot)
     
     def print_schedule(self):
         """Print the final schedule"""
@@ -159,9 +190,8 @@ class GreedyScheduler:
             day_output = []
             
             for slot in range(6):
-                key = (day, slot)
-                if key in self.schedule and len(self.schedule[key]) >= 2:
-                    ras = ', '.join(self.schedule[key])
+                if self.slot_fill[day, slot] >= 2:
+                    ras = ', '.join(self.ras[i].name for i in self.schedule[day, slot])
                     day_output.append(f"  {time_slots[slot]}: {ras}")
                     total_sessions += 1
                     day_has_sessions = True
@@ -182,10 +212,9 @@ class GreedyScheduler:
         print("RA WORKLOAD")
         print("="*60 + "\n")
         
-        for ra in self.ras:
-            stats = self.ra_stats[ra.name]
-            print(f"{ra.name}: {stats['weekly']} slots (limit: {ra.max_slots_per_week})")
-            daily_str = ', '.join([f"{days[i]}:{stats['daily'][i]}" for i in range(5)])
+        for r, ra in enumerate(self.ras):
+            print(f"{ra.name}: {self.weekly[r]} slots (limit: {ra.max_slots_per_week})")
+            daily_str = ', '.join([f"{days[i]}:{self.daily[r, i]}" for i in range(5)])
             print(f"  Daily breakdown: {daily_str}")
             print()
     
@@ -197,21 +226,16 @@ class GreedyScheduler:
         
         gaps = {}
         
-        for ra in self.ras:
-            stats = self.ra_stats[ra.name]
-            if len(stats['slots']) == 0:
+        for ra, day_slots in zip(self.ras, self.day_slots):
+            if not any(day_slots):
                 continue
             
-            # Sort slots by day, then by time
-            sorted_slots = sorted(stats['slots'], key=lambda x: (x[0], x[1]))
-            
             gap_count = 0
-            for i in range(1, len(sorted_slots)):
+            for day in range(5):
                 # Only count gaps on the same day
-                if sorted_slots[i][0] == sorted_slots[i-1][0]:
-                    gap_size = sorted_slots[i][1] - sorted_slots[i-1][1] - 1
-                    if gap_size > 0:
-                        gap_count += gap_size
+                if len(day_slots[day]) > 1:
+                    sorted_slots = np.sort(day_slots[day])
+                    gap_count += int(np.maximum(np.diff(sorted_slots) - 1, 0).sum())
             
             gaps[ra.name] = gap_count
             print(f"{ra.name}: {gap_count} gap slots")
@@ -225,7 +249,7 @@ class GreedyScheduler:
         print("STATISTICS")
         print("="*60 + "\n")
         
-        covered = len(self.schedule)
+        covered = int(np.count_nonzero(self.slot_fill))
         total_slots = 28  # Updated: 30 - 2 (Thursday slots 2 and 3)
         
         # Count impossible slots (< 2 RAs available)